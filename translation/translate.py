@@ -1,60 +1,202 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import glob
 import json
+import logging
 import os
+import pathlib
+from collections import deque
 import re
+import shutil
+import signal
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
 from deep_translator import GoogleTranslator as DeepTranslator
 
+
+class _KeepAliveRequests:
+    """Drop-in for a module-level `requests` import that routes GET/POST
+    through one shared Session, so every call reuses the TLS connection
+    instead of paying a fresh TCP+TLS handshake."""
+
+    def __init__(self):
+        self._session = requests.Session()
+
+    def get(self, *args, **kwargs):
+        return self._session.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._session.post(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+# deep_translator issues a standalone requests.get per translation; pointing
+# its module's `requests` at the shim above enables HTTP keep-alive.
+sys.modules[DeepTranslator.__module__].requests = _KeepAliveRequests()
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the stdlib encoder works, just slower on big files.
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it every file is parsed in full up front.
+    ijson = None
+
+
+def load_json_file(fileName):
+    """Parses a JSON file, using orjson when available."""
+    if orjson is not None:
+        with open(fileName, "rb") as f:
+            return orjson.loads(f.read())
+    with open(fileName, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json_file(fileName, data, pretty: bool = False, fsync: bool = False):
+    """Writes data as JSON (compact by default), using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(fileName, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    else:
+        with open(fileName, mode="w", encoding="utf-8") as f:
+            json.dump(
+                data,
+                f,
+                indent="\t" if pretty else None,
+                separators=None if pretty else (",", ":"),
+                ensure_ascii=False,
+            )
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
 # Languages mapping
 supported_languages = {"it": "it"}
 # This regex matches tags like {tag}, {tag|option}, etc.
-TAG_REGEX = r"{.*?}"
+# Compiled once at module scope: the hot path calls these thousands of times
+# per file and must not rely on re's internal (bounded) pattern cache.
+_TAG_RE = re.compile(r"{.*?}")
+# Digits, whitespace and punctuation that don't count as translatable content.
+# A str.translate deletion table is far cheaper than a regex substitution on
+# the short strings that dominate the data files. \xa0 (non-breaking space,
+# used in the item-property templates) matched the old regex's \s and must
+# stay classified as noise.
+_NOISE = str.maketrans("", "", "0123456789 \t\n\r\f\v\xa0()[].,_-")
+# Placeholder markers produced by links2tags, e.g. (%0%), (%1%), ...
+_PLACEHOLDER_RE = re.compile(r"\(%(\d+)%\)")
+
+
+# Per-translation chatter goes through here; it's silenced unless --verbose.
+log = logging.getLogger("translate")
 
 # Global counters
 todoCharCounter = 0
 maxRuntime = 0
 startTime = time.time()
 disableCacheSave = False
+prettyOutput = False
 currentFileIndex = 0
 totalFilesCount = 0
+# Guards the global counters when files are processed by worker threads.
+counterLock = threading.Lock()
 
 # --- Progress Bar Helpers ---
 
+# isatty() and the terminal size are syscalls; clear_progress_bar runs before
+# and after every translation, so both are resolved once at startup.
+_IS_TTY = sys.stdout.isatty()
+_TERM_COLS = shutil.get_terminal_size((80, 24)).columns if _IS_TTY else 0
+_CLEAR_LINE = "\r" + " " * _TERM_COLS + "\r"
+
+
+def _refresh_term_size(signum=None, frame=None):
+    """Recomputes the cached terminal width (installed as the SIGWINCH handler)."""
+    global _TERM_COLS, _CLEAR_LINE
+    _TERM_COLS = shutil.get_terminal_size((80, 24)).columns
+    _CLEAR_LINE = "\r" + " " * _TERM_COLS + "\r"
+
+
+if _IS_TTY and hasattr(signal, "SIGWINCH"):
+    signal.signal(signal.SIGWINCH, _refresh_term_size)
+
 
 def clear_progress_bar():
     """Clears the current line (where the progress bar is displayed) by printing spaces."""
+    global _last_bar
+    # The bar is no longer on screen, so the next paint must always write.
+    _last_bar = None
     # Move cursor to the beginning of the line, print spaces, then move back.
-    if sys.stdout.isatty():
-        sys.stdout.write("\r" + " " * os.get_terminal_size().columns)
-        sys.stdout.flush()
+    if _IS_TTY:
+        sys.stdout.write(_CLEAR_LINE)
+
+
+# Preallocated bar segments (sized for the default bar_length) and the last
+# rendered line, so unchanged repaints skip both string building and I/O.
+_BAR_FILL = "#" * 50
+_BAR_EMPTY = "-" * 50
+_last_bar = None
 
 
 def print_progress_bar(
     current: int, total: int, prefix: str = "Progress", bar_length: int = 50
 ):
     """Prints a progress bar anchored using \r to overwrite the line."""
+    global _last_bar
     if total == 0:
         return
 
     percent = current / total
-    hashes = "#" * int(round(percent * bar_length))
-    spaces = "-" * (bar_length - len(hashes))
+    filled = int(round(percent * bar_length))
 
-    # Format the progress bar string
+    # Format the progress bar string (sliced from the preallocated segments)
     progress_str = (
-        f"{prefix}: [{hashes}{spaces}] {percent * 100:.1f}% ({current}/{total})"
+        f"{prefix}: [{_BAR_FILL[:filled]}{_BAR_EMPTY[: bar_length - filled]}] "
+        f"{percent * 100:.1f}% ({current}/{total})"
     )
 
+    # Most repaints render the exact same line; skip the write entirely.
+    if progress_str == _last_bar:
+        return
+    _last_bar = progress_str
+
     # Use \r to move the cursor to the beginning of the line and overwrite previous content
     sys.stdout.write(f"\r{progress_str}")
     sys.stdout.flush()
 
 
+# Most repaints draw a visually identical bar, so the per-translation paths
+# only actually repaint every _PAINT_EVERY updates (or when forced).
+_PAINT_EVERY = 32
+_updates_since_paint = 0
+
+
+def repaint_progress_bar(force: bool = False):
+    """Repaints the total-progress bar, throttled unless force is set."""
+    global _updates_since_paint
+    _updates_since_paint += 1
+    if force or _updates_since_paint >= _PAINT_EVERY:
+        _updates_since_paint = 0
+        print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
+
+
 # ----------------------------
 
 
@@ -63,6 +205,10 @@ MAX_RETRIES = 5
 BASE_DELAY = 1.0
 # -------------------------------------
 
+# How many strings to send to Google Translate per HTTP call. Batching
+# amortizes the TLS/RTT cost of a round-trip over many strings.
+BATCH_SIZE = 100
+
 
 class TranslatorService:
     # (TranslatorService remains mostly the same, only minor adjustments for logging)
@@ -71,22 +217,53 @@ class TranslatorService:
         if not self._target_lang:
             raise ValueError(f"Unsupported language code: {language_code}")
 
+        # The cache stays in JSON (compact): the files are git-tracked and
+        # shared with the CI runner, so the on-disk format must not depend on
+        # optional local modules.
         self._cacheFile = cacheFile
         self._cacheDirty = False
         self._cacheData = {}
+        # Append-only journal: new translations are appended here immediately
+        # (O(entry) per write) and folded into the main cache file on sync.
+        self._journalFile = f"{cacheFile}.jsonl"
+        self._journal = None
         self.charCount = 0
         self.cachedCharCount = 0
         self.current_file_name = os.path.basename(cacheFile).replace(".json", "")
 
+        # Strings queued for batch translation (pass 1 of translate_data).
+        self._pending = []
+        self._pendingKeys = set()
+        # Memo for links2tags: identical entries repeat verbatim within a file,
+        # and the (text, links) result is never mutated so it's safe to share.
+        self._tags_memo: dict[str, tuple[str, list]] = {}
+        # One translator instance reused across all batch calls.
+        self._dt = DeepTranslator(source="en", target=self._target_lang)
+        # In-memory LRU: 5etools data repeats many short strings verbatim, and
+        # repeats skip even the triviality regexes this way.
+        self._translate_cached = functools.lru_cache(maxsize=4096)(
+            self._translate_impl
+        )
+
         if os.path.exists(cacheFile):
             try:
-                with open(cacheFile, encoding="utf-8") as f:
-                    self._cacheData = json.load(f)
+                self._cacheData = load_json_file(cacheFile)
                 # print(f"Loaded existing cache from '{cacheFile}'.") # Suppressing this for cleaner output
-            except json.JSONDecodeError:
+            except ValueError:
                 print(f"Warning: Cache file '{cacheFile}' is corrupt. Starting fresh.")
                 self._cacheData = {}
 
+        # Replay journal entries left over from an interrupted run.
+        if os.path.exists(self._journalFile):
+            with open(self._journalFile, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        key, value = json.loads(line)
+                    except ValueError:
+                        continue  # Partial write from an interrupted run
+                    self._cacheData[key] = value
+            self._cacheDirty = True
+
     def __enter__(self):
         return self
 
@@ -107,7 +284,7 @@ class TranslatorService:
             traceback.print_exception(exc_type, exc_val, exc_tb)
 
     def cacheSync(self):
-        """Writes the current cache data to disk."""
+        """Compacts the cache: writes the full data to disk, then drops the journal."""
 
         if self._cacheDirty:
             # Clear bar before printing file save message
@@ -115,58 +292,188 @@ class TranslatorService:
             print(f"\nSaving cache to {self._cacheFile}")
             try:
                 temp_file = f"{self._cacheFile}.swp"
-                with open(temp_file, mode="w", encoding="utf-8") as f:
-                    json.dump(self._cacheData, f, indent="\t", ensure_ascii=False)
-                os.rename(temp_file, self._cacheFile)
+                dump_json_file(temp_file, self._cacheData, fsync=True)
+                # os.replace is atomic and, unlike os.rename, also works on
+                # Windows when the destination already exists.
+                os.replace(temp_file, self._cacheFile)
                 self._cacheDirty = False
+
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                if os.path.exists(self._journalFile):
+                    os.remove(self._journalFile)
             except Exception as e:
                 print(f"Error saving cache: {e}")
 
     def cacheSet(self, key, value):
+        # Always update the in-memory cache: pass 3 of translate_data reads
+        # batch results back through it, and --nocache only promises that
+        # nothing is written back to the cache file.
+        self._cacheData[key] = value
+
         global disableCacheSave
         if disableCacheSave:
             return
-
-        self._cacheData[key] = value
         self._cacheDirty = True
 
+        # Journal the new entry immediately so an interrupted run loses nothing.
+        if self._journal is None:
+            self._journal = open(self._journalFile, mode="a", encoding="utf-8")
+        self._journal.write(json.dumps([key, value], ensure_ascii=False) + "\n")
+        self._journal.flush()
+
     def cacheGet(self, key):
         return self._cacheData.get(key)
 
-    # --- Tag Handling Functions (Unchanged) ---
+    # --- Tag Handling Functions ---
     def links2tags(self, text: str) -> tuple[str, list]:
+        memo = self._tags_memo.get(text)
+        if memo is not None:
+            return memo
+
         links = []
-        count = 0
-        for match in re.finditer(TAG_REGEX, text):
+
+        def _repl(match):
             links.append(match.group(0))
-            text = text.replace(match.group(0), f"(%{count}%)", 1)
-            count += 1
-        return text, links
+            return f"(%{len(links) - 1}%)"
+
+        result = (_TAG_RE.sub(_repl, text), links)
+        if len(self._tags_memo) < 8192:  # Bounded; stop memoizing past this
+            self._tags_memo[text] = result
+        return result
 
     def tags2links(self, text: str, links: list) -> str:
-        for idx, link in enumerate(links):
-            text = text.replace(f"(%{idx}%)", link, 1)
+        def _restore(match):
+            # Guard the index: translation can mangle placeholder digits, and
+            # the source text may contain a literal (%N%).
+            idx = int(match.group(1))
+            return links[idx] if idx < len(links) else match.group(0)
+
+        return _PLACEHOLDER_RE.sub(_restore, text)
+
+    def _needs_translation(self, text: str) -> bool:
+        """Returns False for trivial strings (numbers, punctuation, tags only)."""
+        if len(text) < 5:
+            return False
+        noVars = _TAG_RE.sub("", text) if "{" in text else text
+        return len(noVars.translate(_NOISE)) >= 5
+
+    def collect(self, text: str) -> str:
+        """Pass-1 visitor: queues cache-missing strings for batch translation."""
+        # Known strings need no trivial-input analysis at all. Cache hits are
+        # counted here, once: pass 3 reads every string (including the ones
+        # this flush translates) back through the cache.
+        if text in self._pendingKeys:
+            return text
+        if self.cacheGet(text) is not None:
+            self.cachedCharCount += len(text)
+            return text
+
+        if self._needs_translation(text):
+            self._pendingKeys.add(text)
+            self._pending.append(text)
         return text
 
+    def flush_pending(self):
+        """Translates all queued strings, BATCH_SIZE per DeepTranslator call."""
+        pending = self._pending
+        self._pending = []
+        self._pendingKeys.clear()
+
+        for batch_start in range(0, len(pending), BATCH_SIZE):
+            batch = pending[batch_start : batch_start + BATCH_SIZE]
+
+            # Check Runtime Limit (once per batch)
+            global maxRuntime, startTime
+            if maxRuntime != 0 and time.time() - startTime > maxRuntime:
+                raise Exception("Maximum runtime exceeded - aborting")
+
+            tagged = [self.links2tags(text) for text in batch]
+
+            clear_progress_bar()
+            log.info(
+                "DeepTranslator Batch Call (%d strings, %s chars) for file **%s**",
+                len(batch),
+                f"{sum(len(t) for t in batch):,}",
+                self.current_file_name,
+            )
+            repaint_progress_bar(force=True)
+
+            translated_batch = None
+            last_error = None
+
+            # --- Retry Loop (same backoff as single translations) ---
+            for attempt in range(MAX_RETRIES):
+                if attempt > 0:
+                    delay = BASE_DELAY * (2 ** (attempt - 1))
+                    clear_progress_bar()
+                    log.warning(
+                        "Retrying batch (Attempt %d/%d) after %.1fs delay...",
+                        attempt + 1,
+                        MAX_RETRIES,
+                        delay,
+                    )
+                    repaint_progress_bar(force=True)
+                    time.sleep(delay)
+
+                try:
+                    translated_batch = self._dt.translate_batch(
+                        [tagged_text for tagged_text, _links in tagged]
+                    )
+                    break
+                except Exception as e:
+                    last_error = e
+                    clear_progress_bar()
+                    log.error(
+                        "!!! DeepTranslator Error on attempt %d: %s !!!", attempt + 1, e
+                    )
+                    repaint_progress_bar(force=True)
+            # --- End Retry Loop ---
+
+            if translated_batch is None:
+                clear_progress_bar()
+                log.error(
+                    "!!! Batch translation failed after %d attempts. Strings left untranslated. !!!",
+                    MAX_RETRIES,
+                )
+                if last_error:
+                    traceback.print_exc(limit=5)
+                repaint_progress_bar(force=True)
+                continue
+
+            for original, (_tagged_text, links), translated_text in zip(
+                batch, tagged, translated_batch
+            ):
+                self.charCount += len(original)
+                self.cacheSet(original, self.tags2links(translated_text, links))
+
     def translate(self, text: str) -> str:
-        """Translates text, using cache or deep-translator, with retry logic."""
+        """Translates text; repeated identical inputs return via the LRU memo."""
+        return self._translate_cached(text)
 
-        noVars = re.sub(TAG_REGEX, "", text)
-        if len(re.sub(r"[\d\s()\[\].,_-]+", "", noVars)) < 5:
-            return text
+    def _translate_impl(self, text: str) -> str:
+        """Translates text, using cache or deep-translator, with retry logic."""
 
-        # 1. Check Cache
+        # 1. Check Cache first: the vast majority of calls are hits and skip
+        # the trivial-input analysis entirely. Hits aren't counted here -
+        # collect() already accounted for them in pass 1, and fresh batch
+        # results would otherwise be double-counted as cached.
         cached_result = self.cacheGet(text)
         if cached_result is not None:
-            self.cachedCharCount += len(text)
             return cached_result
 
+        if not self._needs_translation(text):
+            return text
+
         # 🚀 CACHE MISS INDICATION 🚀
         clear_progress_bar()
-        print(
-            f"CACHE MISS! In file **{self.current_file_name}** for text: '{text[:80].replace(os.linesep, ' ')}...'"
+        log.info(
+            "CACHE MISS! In file **%s** for text: '%s...'",
+            self.current_file_name,
+            text[:80].replace(os.linesep, " "),
         )
-        print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
+        repaint_progress_bar(force=True)
         # --------------------------------
 
         # 2. Check Runtime Limit
@@ -180,114 +487,209 @@ class TranslatorService:
         translate_text, links = self.links2tags(text)
 
         last_error = None
+        translated_text = None
 
         # --- Retry Loop Implementation ---
         for attempt in range(MAX_RETRIES):
             if attempt > 0:
                 delay = BASE_DELAY * (2 ** (attempt - 1))
                 clear_progress_bar()
-                print(
-                    f"Retrying translation (Attempt {attempt + 1}/{MAX_RETRIES}) after {delay:.1f}s delay..."
-                )
-                print_progress_bar(
-                    currentFileIndex, totalFilesCount, prefix="Total Progress"
+                log.warning(
+                    "Retrying translation (Attempt %d/%d) after %.1fs delay...",
+                    attempt + 1,
+                    MAX_RETRIES,
+                    delay,
                 )
+                repaint_progress_bar(force=True)
                 time.sleep(delay)
 
-            clear_progress_bar()
-            print(f"DeepTranslator Call ({len(text)} chars): '{text[:60]}...'")
-            print_progress_bar(
-                currentFileIndex, totalFilesCount, prefix="Total Progress"
-            )
+            log.info("DeepTranslator Call (%d chars): '%s...'", len(text), text[:60])
+            repaint_progress_bar()
 
             try:
-                translator = DeepTranslator(source="en", target=self._target_lang)
-                translated_text = translator.translate(translate_text)
+                translated_text = self._dt.translate(translate_text)
                 break
 
             except Exception as e:
                 last_error = e
                 clear_progress_bar()
-                print(f"\n!!! DeepTranslator Error on attempt {attempt + 1}: {e} !!!")
-                print_progress_bar(
-                    currentFileIndex, totalFilesCount, prefix="Total Progress"
+                log.error(
+                    "!!! DeepTranslator Error on attempt %d: %s !!!", attempt + 1, e
                 )
+                repaint_progress_bar(force=True)
         # --- End Retry Loop ---
 
-        if "translated_text" not in locals():
+        if translated_text is None:
             clear_progress_bar()
-            print(
-                f"\n!!! Translation failed after {MAX_RETRIES} attempts. Returning untranslated text. !!!"
+            log.error(
+                "!!! Translation failed after %d attempts. Returning untranslated text. !!!",
+                MAX_RETRIES,
             )
             if last_error:
                 traceback.print_exc(limit=5)
-            print_progress_bar(
-                currentFileIndex, totalFilesCount, prefix="Total Progress"
-            )
+            repaint_progress_bar(force=True)
             return text
 
         # 4. Restore Tags
         translated_text = self.tags2links(translated_text, links)
 
         # Store in cache and return
-        clear_progress_bar()
-        print(f" -> Translated: '{translated_text[:60]}...'\n")
+        log.info(" -> Translated: '%s...'", translated_text[:60])
         self.cacheSet(text, translated_text)
-        print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
+        repaint_progress_bar()
         return translated_text
 
 
+# --- Per-key traversal handlers ---
+# The set of translatable keys is fixed, so each one dispatches straight to a
+# dedicated handler instead of re-running a membership/type if-chain per node.
+
+
+def _handle_string_field(node, k, v, visit, stack):
+    """entry/effect: a directly translatable string value."""
+    if type(v) is str:
+        node[k] = visit(v)
+    else:
+        stack.append(v)
+
+
+def _handle_list_field(node, k, v, visit, stack):
+    """entries/rows/...: a list of translatable strings, rows or sub-entries."""
+    if type(v) is not list:
+        stack.append(v)
+        return
+
+    # v is node[k]; writing through the local refs skips the re-subscripting.
+    for idx, entry in enumerate(v):
+        te = type(entry)
+        if te is list:
+            for elidx, el in enumerate(entry):
+                if type(el) is str and len(el) > 2:
+                    entry[elidx] = visit(el)
+
+        if te is str:
+            v[idx] = visit(entry)
+        else:
+            stack.append(entry)
+
+
+def _handle_items(node, k, v, visit, stack):
+    """items: only translated inside rendered lists (node type == "list")."""
+    if type(v) is list:
+        if node.get("type") == "list":
+            _handle_list_field(node, k, v, visit, stack)
+    else:
+        stack.append(v)
+
+
+def _handle_other(node, k, v, visit, stack):
+    """other: either a dict of string sections or a plain translatable list."""
+    tv = type(v)
+    if tv is dict:
+        for items in v.values():
+            for idx, item in enumerate(items):
+                items[idx] = visit(item)
+    elif tv is list:
+        _handle_list_field(node, k, v, visit, stack)
+    else:
+        stack.append(v)
+
+
+_HANDLERS = {
+    "entry": _handle_string_field,
+    "effect": _handle_string_field,
+    "entries": _handle_list_field,
+    "rows": _handle_list_field,
+    "headerEntries": _handle_list_field,
+    "reasons": _handle_list_field,
+    "lifeTrinket": _handle_list_field,
+    "items": _handle_items,
+    "other": _handle_other,
+}
+
+
+def walk_strings(visit, data):
+    """Walks the JSON structure, applying `visit` to every translatable string.
+
+    Iterative (explicit work-stack) to avoid thousands of Python stack frames
+    on deeply nested data files.
+    """
+    stack = deque([data])
+    while stack:
+        node = stack.pop()
+        t = type(node)
+        if t is list:
+            stack.extend(node)
+        elif t is dict:
+            for k, v in node.items():
+                handler = _HANDLERS.get(k)
+                if handler is not None:
+                    handler(node, k, v, visit, stack)
+                else:
+                    stack.append(v)
+
+
 def translate_data(translator: TranslatorService, data):
-    # (translate_data remains completely unchanged)
-    if type(data) is list:
-        for element in data:
-            translate_data(translator, element)
-    elif type(data) is dict:
-        for k, v in data.items():
-            if k in ["entry", "effect"] and type(v) is str:
-                data[k] = translator.translate(v)
-            elif k == "other" and type(v) is dict:
-                for section, items in v.items():
-                    for idx, item in enumerate(items):
-                        data[k][section][idx] = translator.translate(item)
-            elif (
-                k
-                in [
-                    "entries",
-                    "items",
-                    "rows",
-                    "headerEntries",
-                    "reasons",
-                    "other",
-                    "lifeTrinket",
-                ]
-                and type(v) is list
-            ):
-                if k == "items" and ("type" not in data or data["type"] != "list"):
-                    continue
-
-                for idx, entry in enumerate(v):
-                    if type(entry) is list:
-                        for elidx, el in enumerate(entry):
-                            if type(el) is str and len(el) > 2:
-                                data[k][idx][elidx] = translator.translate(el)
-
-                    if type(entry) is str:
-                        data[k][idx] = translator.translate(entry)
-                    else:
-                        translate_data(translator, entry)
-            else:
-                translate_data(translator, v)
+    # Pass 1: collect every cache-missing string without touching the network.
+    walk_strings(translator.collect, data)
+    # Pass 2: translate the collected strings in batched HTTP calls.
+    translator.flush_pending()
+    # Pass 3: re-walk applying the (now cached) translations.
+    walk_strings(translator.translate, data)
+
+
+def translate_stream(translator: TranslatorService, fileName: str):
+    """Streams top-level sections with ijson, translating each one while the
+    rest of the file is still being parsed."""
+    with open(fileName, "rb") as f:
+        # ijson.kvitems yields nothing for a non-object root (e.g. the
+        # array-rooted changelog.json), so sniff the first byte and fall back
+        # to a full parse for anything that isn't a JSON object.
+        head = f.read(64)
+        if head.lstrip()[:1] != b"{":
+            translate_data(translator, load_json_file(fileName))
+            return
+        f.seek(0)
+
+        for _key, section in ijson.kvitems(f, ""):
+            translate_data(translator, section)
+
+
+# Source data files live under this root; cache/output paths mirror it.
+# Resolved so both relative and absolute input paths land on the same root.
+DATA_ROOT = pathlib.Path("data").resolve()
+
+# Directories already created this run, so repeated files skip the syscall.
+_made_dirs = set()
+
+
+def ensure_parent_dir(path: pathlib.Path):
+    """Creates the parent directory of `path`, memoized per directory."""
+    parent = str(path.parent)
+    if parent not in _made_dirs:
+        os.makedirs(parent, exist_ok=True)
+        _made_dirs.add(parent)
 
 
 def translate_file(language: str, fileName: str, writeJSON: bool):
     """Sets up paths, loads file, translates content, and saves output."""
 
-    # Define file paths
-    cache_file = fileName.replace("data/", f"translation/cache/{language}/")
-    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-    output_file = fileName.replace("data/", f"data.{language}/")
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    # Define file paths by mirroring the path relative to the data root, so
+    # a stray "data/" later in the path can't get mangled. Files outside the
+    # root are an error: a fallback here could point cache/output at the
+    # source file itself and overwrite it.
+    try:
+        rel = pathlib.Path(fileName).resolve().relative_to(DATA_ROOT)
+    except ValueError:
+        raise ValueError(
+            f"'{fileName}' is not under the data root '{DATA_ROOT}' - cannot derive cache/output paths"
+        )
+    cache_path = pathlib.Path("translation/cache") / language / rel
+    output_path = pathlib.Path(f"data.{language}") / rel
+    ensure_parent_dir(cache_path)
+    ensure_parent_dir(output_path)
+    cache_file = str(cache_path)
+    output_file = str(output_path)
 
     data = {}
 
@@ -296,11 +698,16 @@ def translate_file(language: str, fileName: str, writeJSON: bool):
         translator.current_file_name = os.path.basename(fileName)
 
         try:
-            with open(fileName, encoding="utf-8") as f:
-                data = json.load(f)
+            if ijson is not None and not writeJSON:
+                # Cache-warming run: no output document is needed, so stream
+                # the file section by section instead of materializing it all
+                # before the first translation.
+                translate_stream(translator, fileName)
+            else:
+                data = load_json_file(fileName)
 
-            # Start translation traversal
-            translate_data(translator, data)
+                # Start translation traversal
+                translate_data(translator, data)
 
         except Exception as e:
             clear_progress_bar()
@@ -316,12 +723,30 @@ def translate_file(language: str, fileName: str, writeJSON: bool):
         print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
 
         global todoCharCounter
-        todoCharCounter += translator.charCount
+        with counterLock:
+            todoCharCounter += translator.charCount
 
     # Write the output file
     if writeJSON:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent="\t", ensure_ascii=False)
+        dump_json_file(output_file, data, pretty=prettyOutput)
+
+
+def process_file(language: str, fileName: str, writeJSON: bool):
+    """Worker entry point: translates one file and updates the done counter."""
+    global currentFileIndex
+
+    if not fileName.startswith("data/generated"):
+        clear_progress_bar()
+        print(f"\n--- Processing File: {fileName} ---")
+        print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
+
+        translate_file(language, fileName, writeJSON)
+
+    with counterLock:
+        currentFileIndex += 1
+
+    clear_progress_bar()
+    print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
 
 
 if __name__ == "__main__":
@@ -352,6 +777,22 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable writing new translations back to the cache file (still loads/retrieves from cache).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files to translate in parallel (translation is network-bound).",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the translated JSON output files (larger and slower to write).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show per-translation chatter (cache misses, DeepTranslator calls).",
+    )
     parser.add_argument(
         "--suppress-errors",
         action="store_true",
@@ -366,7 +807,12 @@ if __name__ == "__main__":
     args = parser.parse_args()
     maxRuntime = args.maxrun
 
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s"
+    )
+
     disableCacheSave = args.nocache
+    prettyOutput = args.pretty
     suppressErrors = args.suppress_errors
 
     if args.language.lower() not in supported_languages:
@@ -387,31 +833,24 @@ if __name__ == "__main__":
         )
         sys.exit(1)
 
+    # Largest files first (LPT schedule): the huge bestiary files start
+    # immediately and the many tiny files fill in behind them, instead of a
+    # big file starting last and stalling the whole pool at the end.
+    all_files.sort(key=os.path.getsize, reverse=True)
+
     # 🌟 Initialize global file counters 🌟
     totalFilesCount = len(all_files)
     currentFileIndex = 0
 
     # Print the initial, empty progress bar
     print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
-    # Main translation loop
-    for file in all_files:
-        currentFileIndex += 1  # Increment file counter immediately
-
-        # 1. Clear the bar so the new file message appears above it
-        clear_progress_bar()
-
-        # 2. Display file progress
-        print(
-            f"\n--- Processing File {currentFileIndex}/{totalFilesCount} ({((currentFileIndex) / totalFilesCount) * 100:.1f}%): {file} ---"
-        )
-
-        if file.startswith("data/generated"):
-            continue
-
-        # 3. Print the progress bar again *after* the file header is printed
-        print_progress_bar(currentFileIndex, totalFilesCount, prefix="Total Progress")
 
-        translate_file(args.language.lower(), file, args.translate)
+    # Main translation loop: each file is independent (its own cache file), and
+    # nearly all the time is spent waiting on Google Translate responses, so
+    # files are dispatched to a thread pool.
+    language = args.language.lower()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(lambda f: process_file(language, f, args.translate), all_files))
     print(f"\n--- Translation Complete ---")
 
     # Final output